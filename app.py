@@ -6,7 +6,7 @@ from src.loaders.pdf_loader import load_pdfs
 from src.splitter.text_splitter import split_docs
 from src.vectorstore.chroma_store import load_or_update_vectorstore
 from src.retriever.get_retriever import get_similarity_retriever, get_mmr_retriever
-from src.llm.ollama_llm import get_llm
+from src.llm.llm_gateway import get_llm_gateway
 from src.memory.chat_memory import get_memory
 from src.rag.rag_chain import run_rag_with_memory
 from src.utils.helpers import extract_sources
@@ -33,7 +33,7 @@ def get_retrievers():
 
 @st.cache_resource(show_spinner=True)
 def get_llm_cached():
-    return get_llm()
+    return get_llm_gateway()
 
 
 def init_session_state():
@@ -116,6 +116,14 @@ def main():
         st.write(f"Documents loaded: **{len(docs)}**")
         st.write(f"Chunks created: **{len(splits)}**")
 
+        llm_stats = get_llm_cached().metrics()
+        st.write(f"LLM queue depth: **{llm_stats['queue_depth']}** (running: {llm_stats['running']})")
+        if llm_stats["latency_p50_s"] is not None:
+            st.write(
+                f"LLM latency p50 / p95: **{llm_stats['latency_p50_s']:.1f}s** / "
+                f"**{llm_stats['latency_p95_s']:.1f}s**"
+            )
+
     # Main retrievers / llm
     retriever_sim, retriever_mmr = get_retrievers()
     llm = get_llm_cached()
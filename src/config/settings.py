@@ -14,10 +14,27 @@ EMBEDDING_DEVICE = "cpu"
 # Chunking
 CHUNK_SIZE = 600
 CHUNK_OVERLAP = 100
+# "character" (CHUNK_SIZE chars) or "token" (MiniLM word-pieces, no silent truncation).
+# Switching mode on an existing CHROMA_DIR mixes two chunk geometries in one index:
+# delete CHROMA_DIR so it is rebuilt from all PDFs after changing this.
+SPLITTER_MODE = "character"
+MINILM_MAX_TOKENS = 256  # all-MiniLM-L6-v2 max_seq_length, incl. [CLS]/[SEP]
+CHUNK_TOKEN_OVERLAP = 32
+SPLIT_WORKERS = os.cpu_count() or 1
+PARALLEL_SPLIT_MIN_DOCS = 200  # pages; smaller batches are split in-process (rough default, not benchmarked)
 
 # LLM / Ollama
 LLM_MODEL = "gemma3:4b"
 LLM_TEMPERATURE = 0.1
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+LLM_KEEP_ALIVE = "30m"  # keep the model loaded between requests
+LLM_NUM_CTX = 4096
+LLM_TIMEOUT = 120  # seconds, per HTTP request to Ollama
+
+# LLM gateway
+LLM_MAX_CONCURRENCY = 2
+LLM_QUEUE_SIZE = 32
+LLM_REQUEST_TIMEOUT = 180  # seconds, queue wait + generation
 
 # Retrieval
 K = 4
@@ -0,0 +1,327 @@
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage, HumanMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.config.settings import (
+    LLM_MAX_CONCURRENCY,
+    LLM_QUEUE_SIZE,
+    LLM_REQUEST_TIMEOUT,
+)
+from src.llm.ollama_llm import get_llm
+
+
+class LLMGatewayBusyError(RuntimeError):
+    """Raised when the gateway queue is full and cannot accept more requests."""
+
+
+class LLMGatewayClosedError(RuntimeError):
+    """Raised when submitting to a gateway that has been shut down."""
+
+
+class _Job:
+    """One underlying LLM call, possibly shared by several coalesced callers."""
+
+    def __init__(
+        self,
+        key: str,
+        messages: List[BaseMessage],
+        priority: int,
+        config: Optional[RunnableConfig],
+        kwargs: Dict[str, Any],
+    ):
+        self.key = key
+        self.messages = messages
+        self.priority = priority
+        self.config = config
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.waiters = 0
+        self.started = False
+        self.enqueued_at = time.perf_counter()
+
+
+class LLMRequest:
+    """
+    Handle returned by LLMGateway.submit().
+    Each caller gets its own handle, even when the underlying call is coalesced.
+    """
+
+    def __init__(self, gateway: "LLMGateway", job: _Job):
+        self._gateway = gateway
+        self._job = job
+        self._released = False
+
+    def result(self, timeout: Optional[float] = None) -> BaseMessage:
+        """
+        Wait for the answer and raise TimeoutError after `timeout` seconds.
+        On timeout this caller is detached: a call still waiting in the queue is
+        dropped, but one that already reached Ollama cannot be interrupted and
+        keeps its worker busy until it finishes or hits the HTTP timeout (LLM_TIMEOUT).
+        """
+        try:
+            return self._job.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._gateway._record("timeouts")
+            self.cancel()
+            raise TimeoutError(f"LLM request did not finish within {timeout}s") from None
+
+    def cancel(self) -> bool:
+        """
+        Detach this caller. The underlying call is only cancelled when no other
+        caller is waiting on it and it has not started yet.
+        Returns True if the underlying call was cancelled.
+        """
+        if self._released:
+            return False
+        self._released = True
+        return self._gateway._release(self._job)
+
+    def done(self) -> bool:
+        return self._job.future.done()
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+class LLMGateway(Runnable[LanguageModelInput, BaseMessage]):
+    """
+    Thread-safe front door to the local LLM.
+
+    - bounded priority queue (lower number = served first)
+    - at most `max_concurrency` calls to Ollama at once
+    - identical prompts already queued or running share one call
+    - per-request timeout and cancellation
+    - queue-depth and latency metrics via metrics()
+
+    It is a Runnable, so it drops into the LCEL chain in place of ChatOllama.
+    Point it at a fake Ollama server by passing get_llm(base_url=...) as `llm`.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[BaseChatModel] = None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        queue_size: int = LLM_QUEUE_SIZE,
+        timeout: Optional[float] = LLM_REQUEST_TIMEOUT,
+        latency_window: int = 256,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.llm = llm or get_llm()
+        self.timeout = timeout
+        self.queue_size = queue_size
+
+        # Unbounded on purpose: capacity is enforced on live jobs (self._pending),
+        # so cancelled entries waiting to be skipped never cause a false "busy".
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Job] = {}
+        self._pending = 0
+        self._running = 0
+        self._closed = False
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._queue_waits: deque = deque(maxlen=latency_window)
+        self._counters = {
+            "submitted": 0,
+            "coalesced": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+        }
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"llm-gateway-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def submit(
+        self,
+        input: LanguageModelInput,
+        priority: int = 0,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> LLMRequest:
+        """
+        Queue a prompt and return a handle without waiting for the answer.
+        `config` and `kwargs` (e.g. stop=...) are passed to the LLM. kwargs are part
+        of the coalescing key; a coalesced call keeps the first caller's config.
+        Joining a queued call with a better (lower) priority moves that call up.
+        Raises LLMGatewayBusyError if the queue is full.
+        """
+        messages = self._to_messages(input)
+        key = self._make_key(messages, kwargs)
+
+        with self._lock:
+            if self._closed:
+                raise LLMGatewayClosedError("LLM gateway has been shut down")
+
+            job = self._inflight.get(key)
+            if job is not None:
+                job.waiters += 1
+                self._counters["coalesced"] += 1
+                if priority < job.priority and not job.started:
+                    # The old entry is skipped by the worker once the job has started
+                    job.priority = priority
+                    self._queue.put((priority, next(self._seq), job))
+                return LLMRequest(self, job)
+
+            if self._pending >= self.queue_size:
+                self._counters["rejected"] += 1
+                raise LLMGatewayBusyError(
+                    f"LLM queue is full ({self.queue_size} pending requests)"
+                )
+
+            job = _Job(key, messages, priority, config, kwargs)
+            job.waiters = 1
+            self._queue.put((priority, next(self._seq), job))
+            self._pending += 1
+            self._inflight[key] = job
+            self._counters["submitted"] += 1
+            return LLMRequest(self, job)
+
+    def invoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        *,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> BaseMessage:
+        """
+        Submit a prompt and block until the answer is ready.
+        """
+        request = self.submit(input, priority=priority, config=config, **kwargs)
+        return request.result(timeout=self.timeout if timeout is None else timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue depth, counters and latency (seconds) over the recent window.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = list(self._queue_waits)
+            stats = dict(self._counters)
+            stats["queue_depth"] = self._pending
+            stats["running"] = self._running
+
+        stats["latency_avg_s"] = sum(latencies) / len(latencies) if latencies else None
+        stats["latency_p50_s"] = _percentile(latencies, 0.50)
+        stats["latency_p95_s"] = _percentile(latencies, 0.95)
+        stats["queue_wait_avg_s"] = sum(waits) / len(waits) if waits else None
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting requests; workers exit once the queued ones are served.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._seq), None))
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    @staticmethod
+    def _to_messages(input: LanguageModelInput) -> List[BaseMessage]:
+        if isinstance(input, PromptValue):
+            return input.to_messages()
+        if isinstance(input, str):
+            return [HumanMessage(content=input)]
+        return convert_to_messages(input)
+
+    @staticmethod
+    def _make_key(messages: List[BaseMessage], kwargs: Dict[str, Any]) -> str:
+        return json.dumps(
+            [[[m.type, m.content] for m in messages], kwargs],
+            default=str,
+            sort_keys=True,
+        )
+
+    def _record(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _release(self, job: _Job) -> bool:
+        with self._lock:
+            job.waiters -= 1
+            if job.waiters > 0 or job.started:
+                return False
+            job.future.cancel()
+            self._pending -= 1
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            self._counters["cancelled"] += 1
+            return True
+
+    def _finish(self, job: _Job, started: float, failed: bool):
+        with self._lock:
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            self._running -= 1
+            self._counters["failed" if failed else "completed"] += 1
+            if not failed:
+                self._latencies.append(time.perf_counter() - started)
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+
+            started = time.perf_counter()
+            with self._lock:
+                # Stale entry: cancelled, or already picked up via a re-queued priority
+                if job.started or job.future.cancelled():
+                    continue
+                job.started = True
+                self._pending -= 1
+                self._running += 1
+                self._queue_waits.append(started - job.enqueued_at)
+            job.future.set_running_or_notify_cancel()
+
+            try:
+                result = self.llm.invoke(job.messages, job.config, **job.kwargs)
+            except Exception as e:
+                self._finish(job, started, failed=True)
+                job.future.set_exception(e)
+            else:
+                self._finish(job, started, failed=False)
+                job.future.set_result(result)
+
+
+def get_llm_gateway(llm: Optional[BaseChatModel] = None) -> LLMGateway:
+    """
+    Returns an LLMGateway wrapping the configured ChatOllama.
+    """
+    return LLMGateway(llm=llm)
@@ -1,9 +1,23 @@
+from typing import Optional, Union
+
 from langchain_ollama import ChatOllama
 
-from src.config.settings import LLM_MODEL, LLM_TEMPERATURE
+from src.config.settings import (
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    OLLAMA_BASE_URL,
+    LLM_KEEP_ALIVE,
+    LLM_NUM_CTX,
+    LLM_TIMEOUT,
+)
 
 
-def get_llm() -> ChatOllama:
+def get_llm(
+    base_url: Optional[str] = None,
+    keep_alive: Optional[Union[int, str]] = None,
+    num_ctx: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> ChatOllama:
     """
     Returns a ChatOllama instance with the configured model.
     Make sure you have Ollama installed and have run:
@@ -13,5 +27,9 @@ def get_llm() -> ChatOllama:
     llm = ChatOllama(
         model=LLM_MODEL,
         temperature=LLM_TEMPERATURE,
+        base_url=OLLAMA_BASE_URL if base_url is None else base_url,
+        keep_alive=LLM_KEEP_ALIVE if keep_alive is None else keep_alive,
+        num_ctx=LLM_NUM_CTX if num_ctx is None else num_ctx,
+        client_kwargs={"timeout": LLM_TIMEOUT if timeout is None else timeout},
     )
     return llm
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Dict, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
-from src.config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+from src.config.settings import CHUNK_SIZE, CHUNK_OVERLAP, SPLITTER_MODE, MINILM_MAX_TOKENS
+from src.splitter.token_splitter import split_docs_by_tokens, count_tokens
 
 
 def get_text_splitter() -> RecursiveCharacterTextSplitter:
@@ -16,6 +17,44 @@ def get_text_splitter() -> RecursiveCharacterTextSplitter:
     return splitter
 
 
-def split_docs(docs: List[Document]) -> List[Document]:
-    splitter = get_text_splitter()
-    return splitter.split_documents(docs)
+def split_docs(docs: List[Document], mode: Optional[str] = None) -> List[Document]:
+    """
+    Split docs into chunks.
+    mode="token" packs chunks to the MiniLM token window, "character" cuts at CHUNK_SIZE chars.
+    """
+    mode = mode or SPLITTER_MODE
+    if mode == "token":
+        return split_docs_by_tokens(docs)
+    if mode == "character":
+        splitter = get_text_splitter()
+        return splitter.split_documents(docs)
+    raise ValueError(f"Unknown splitter mode: {mode!r} (expected 'token' or 'character')")
+
+
+def count_truncated(chunks: List[Document]) -> int:
+    """
+    Number of chunks longer than the MiniLM window, i.e. silently cut at embedding time.
+    """
+    lengths = count_tokens([chunk.page_content for chunk in chunks])
+    return sum(1 for n in lengths if n > MINILM_MAX_TOKENS)
+
+
+def truncation_report(docs: List[Document]) -> Dict[str, Dict[str, int]]:
+    """
+    Split docs with both modes and report chunk counts and truncated chunks for each.
+    """
+    report = {}
+    for mode in ("character", "token"):
+        chunks = split_docs(docs, mode=mode)
+        report[mode] = {
+            "chunks": len(chunks),
+            "truncated": count_truncated(chunks),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    from src.loaders.pdf_loader import load_pdfs
+
+    for mode, stats in truncation_report(load_pdfs()).items():
+        print(f"[INFO] {mode:<9} chunks: {stats['chunks']:>6}  truncated: {stats['truncated']:>6}")
@@ -0,0 +1,131 @@
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from transformers import AutoTokenizer, PreTrainedTokenizerFast
+
+from src.config.settings import (
+    MINILM_MODEL,
+    MINILM_MAX_TOKENS,
+    CHUNK_TOKEN_OVERLAP,
+    SPLIT_WORKERS,
+    PARALLEL_SPLIT_MIN_DOCS,
+)
+
+# Paragraphs, lines, then sentence ends, so chunks are packed from whole sentences
+SENTENCE_SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", "; ", " ", ""]
+
+
+@lru_cache(maxsize=1)
+def get_tokenizer() -> PreTrainedTokenizerFast:
+    """
+    Returns the (cached) fast tokenizer of the MiniLM embedding model.
+    """
+    return AutoTokenizer.from_pretrained(MINILM_MODEL, use_fast=True)
+
+
+def count_tokens(texts: List[str]) -> List[int]:
+    """
+    Token count of each text as the embedding model sees it (incl. special tokens).
+    """
+    if not texts:
+        return []
+    encoded = get_tokenizer()(texts, add_special_tokens=True)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+@lru_cache(maxsize=1)
+def get_token_splitter() -> RecursiveCharacterTextSplitter:
+    """
+    Returns a splitter that measures chunks in MiniLM word-pieces.
+    Sentences are packed up to the model window, leaving room for [CLS]/[SEP].
+    """
+    tokenizer = get_tokenizer()
+    chunk_size = MINILM_MAX_TOKENS - tokenizer.num_special_tokens_to_add()
+    splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+        tokenizer,
+        chunk_size=chunk_size,
+        chunk_overlap=CHUNK_TOKEN_OVERLAP,
+        separators=SENTENCE_SEPARATORS,
+        keep_separator="end",
+    )
+    return splitter
+
+
+def _split_batch(docs: List[Document]) -> List[Document]:
+    """Process-pool entry point: each worker builds its splitter once."""
+    return get_token_splitter().split_documents(docs)
+
+
+# One pool for the whole process, created on first use and reused afterwards,
+# so workers import transformers and load the tokenizer only once.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Runs once in each worker process."""
+    # Parallelism comes from the processes; one Rust thread pool each would oversubscribe cores
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    get_token_splitter()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            # spawn, not fork: never fork the app process once LLM threads / torch are live
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_split_pool():
+    """
+    Stop the splitter worker processes (they are restarted on next use).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_split_pool)
+
+
+def split_docs_by_tokens(
+    docs: List[Document],
+    workers: Optional[int] = None,
+) -> List[Document]:
+    """
+    Split docs with the token splitter.
+    Large batches are spread across CPU cores; chunk order is preserved.
+    """
+    workers = workers or SPLIT_WORKERS
+    if workers <= 1 or len(docs) < PARALLEL_SPLIT_MIN_DOCS:
+        return _split_batch(docs)
+
+    # A few batches per worker keeps cores busy without pickling every page separately
+    batch_size = math.ceil(len(docs) / (workers * 4))
+    batches = [docs[i : i + batch_size] for i in range(0, len(docs), batch_size)]
+
+    chunks = []
+    for batch_chunks in _get_pool(workers).map(_split_batch, batches):
+        chunks.extend(batch_chunks)
+    return chunks
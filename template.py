@@ -35,6 +35,7 @@ files = [
 
     "src/splitter/__init__.py",
     "src/splitter/text_splitter.py",
+    "src/splitter/token_splitter.py",
 
     "src/embeddings/__init__.py",
     "src/embeddings/minilm_embeddings.py",
@@ -47,6 +48,7 @@ files = [
 
     "src/llm/__init__.py",
     "src/llm/ollama_llm.py",
+    "src/llm/llm_gateway.py",
 
     "src/rag/__init__.py",
     "src/rag/rag_chain.py",
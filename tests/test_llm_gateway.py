@@ -0,0 +1,230 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("langchain_ollama")
+
+from src.llm.llm_gateway import LLMGateway, LLMGatewayBusyError, LLMGatewayClosedError
+from src.llm.ollama_llm import get_llm
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """
+    Minimal stand-in for Ollama's /api/chat.
+    Echoes the last message back after `delay` seconds and records what it saw.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__(("127.0.0.1", 0), _FakeOllamaHandler)
+        self.delay = delay
+        self.prompts = []
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.started = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+
+        with server.lock:
+            server.prompts.append(prompt)
+            server.requests.append(body)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        server.started.set()
+
+        time.sleep(server.delay)
+
+        with server.lock:
+            server.active -= 1
+
+        payload = {
+            "model": body["model"],
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": f"echo: {prompt}"},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 1,
+            "eval_count": 1,
+        }
+        data = (json.dumps(payload) + "\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_ollama():
+    server = FakeOllama()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_gateway(server, **kwargs) -> LLMGateway:
+    return LLMGateway(get_llm(base_url=server.base_url, timeout=5), **kwargs)
+
+
+def wait_for_start(server):
+    assert server.started.wait(timeout=5)
+    server.started.clear()
+
+
+def test_identical_prompts_are_coalesced(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=2)
+    n = 5
+    answers = []
+    threads = [
+        threading.Thread(target=lambda: answers.append(gateway.invoke("same").content))
+        for _ in range(n)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert answers == ["echo: same"] * n
+    assert fake_ollama.prompts == ["same"]
+    assert gateway.metrics()["coalesced"] == n - 1
+    gateway.shutdown()
+
+
+def test_concurrency_is_capped(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=2)
+    requests = [gateway.submit(f"prompt {i}") for i in range(6)]
+    for request in requests:
+        request.result(timeout=5)
+
+    assert len(fake_ollama.prompts) == 6
+    assert fake_ollama.max_active == 2
+    gateway.shutdown()
+
+
+def test_lower_priority_number_is_served_first(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1)
+    blocker = gateway.submit("blocker")
+    wait_for_start(fake_ollama)
+
+    low = gateway.submit("low", priority=5)
+    high = gateway.submit("high", priority=0)
+    mid = gateway.submit("mid", priority=1)
+    for request in (blocker, low, high, mid):
+        request.result(timeout=5)
+
+    assert fake_ollama.prompts == ["blocker", "high", "mid", "low"]
+    gateway.shutdown()
+
+
+def test_coalesced_caller_raises_priority(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1)
+    blocker = gateway.submit("blocker")
+    wait_for_start(fake_ollama)
+
+    other = gateway.submit("other", priority=5)
+    shared = gateway.submit("shared", priority=10)
+    shared_again = gateway.submit("shared", priority=0)
+    for request in (blocker, other, shared, shared_again):
+        request.result(timeout=5)
+
+    assert fake_ollama.prompts == ["blocker", "shared", "other"]
+    gateway.shutdown()
+
+
+def test_full_queue_raises_busy_and_cancel_frees_slot(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1, queue_size=1)
+    blocker = gateway.submit("blocker")
+    wait_for_start(fake_ollama)
+
+    queued = gateway.submit("queued")
+    with pytest.raises(LLMGatewayBusyError):
+        gateway.submit("overflow")
+    assert gateway.metrics()["rejected"] == 1
+
+    assert queued.cancel()
+    replacement = gateway.submit("replacement")
+    blocker.result(timeout=5)
+    replacement.result(timeout=5)
+    assert "queued" not in fake_ollama.prompts
+    gateway.shutdown()
+
+
+def test_timeout_cancels_queued_job(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1)
+    blocker = gateway.submit("blocker")
+    wait_for_start(fake_ollama)
+
+    with pytest.raises(TimeoutError):
+        gateway.invoke("too slow", timeout=0.05)
+
+    blocker.result(timeout=5)
+    gateway.shutdown()
+
+    stats = gateway.metrics()
+    assert stats["timeouts"] == 1
+    assert stats["cancelled"] == 1
+    assert stats["queue_depth"] == 0
+    assert fake_ollama.prompts == ["blocker"]
+
+
+def test_metrics_report_queue_depth_and_latency(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1)
+    blocker = gateway.submit("blocker")
+    wait_for_start(fake_ollama)
+    queued = [gateway.submit(f"queued {i}") for i in range(3)]
+
+    stats = gateway.metrics()
+    assert stats["queue_depth"] == 3
+    assert stats["running"] == 1
+    assert stats["latency_p50_s"] is None
+
+    for request in [blocker] + queued:
+        request.result(timeout=5)
+
+    stats = gateway.metrics()
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] == 4
+    assert stats["latency_p50_s"] >= fake_ollama.delay
+    assert stats["latency_p95_s"] >= stats["latency_p50_s"]
+    assert stats["queue_wait_avg_s"] > 0
+    gateway.shutdown()
+
+
+def test_kwargs_reach_ollama_and_split_coalescing(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=2)
+    first = gateway.submit("same", stop=["\n"])
+    second = gateway.submit("same")
+    first.result(timeout=5)
+    second.result(timeout=5)
+
+    assert len(fake_ollama.prompts) == 2
+    stops = [body.get("options", {}).get("stop") for body in fake_ollama.requests]
+    assert ["\n"] in stops
+    gateway.shutdown()
+
+
+def test_shutdown_rejects_new_requests(fake_ollama):
+    gateway = make_gateway(fake_ollama, max_concurrency=1)
+    gateway.shutdown()
+    with pytest.raises(LLMGatewayClosedError):
+        gateway.submit("late")
@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip("transformers")
+pytest.importorskip("langchain_text_splitters")
+
+from langchain_core.documents import Document
+
+from src.config.settings import MINILM_MAX_TOKENS, CHUNK_TOKEN_OVERLAP
+from src.splitter import token_splitter
+from src.splitter.token_splitter import (
+    count_tokens,
+    get_tokenizer,
+    shutdown_split_pool,
+    split_docs_by_tokens,
+)
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    try:
+        return get_tokenizer()
+    except OSError as e:
+        pytest.skip(f"MiniLM tokenizer not available: {e}")
+
+
+def make_page(page: int, sentences: int = 60) -> Document:
+    text = " ".join(
+        f"Sentence {i} on page {page} describes reaction rate k{i} at {300 + i} kelvin."
+        for i in range(sentences)
+    )
+    return Document(page_content=text, metadata={"source": "test.pdf", "page": page})
+
+
+def overlap_text(prev: str, nxt: str) -> str:
+    """Longest suffix of prev that nxt starts with."""
+    for i in range(len(prev)):
+        if nxt.startswith(prev[i:].lstrip()) and prev[i:].strip():
+            return prev[i:].strip()
+    return ""
+
+
+def test_chunks_fit_model_window(tokenizer):
+    dense = Document(page_content="x" + "9" * 5000 + " " + "α" * 3000, metadata={})
+    chunks = split_docs_by_tokens([make_page(0), dense], workers=1)
+
+    lengths = count_tokens([c.page_content for c in chunks])
+    assert len(chunks) > 2
+    assert max(lengths) <= MINILM_MAX_TOKENS
+
+
+def test_consecutive_chunks_overlap_by_token_budget(tokenizer):
+    chunks = split_docs_by_tokens([make_page(0)], workers=1)
+    assert len(chunks) > 2
+
+    for prev, nxt in zip(chunks, chunks[1:]):
+        shared = overlap_text(prev.page_content, nxt.page_content)
+        n_tokens = len(tokenizer.tokenize(shared))
+        assert CHUNK_TOKEN_OVERLAP // 2 <= n_tokens <= CHUNK_TOKEN_OVERLAP
+
+
+def test_parallel_split_matches_serial(tokenizer, monkeypatch):
+    docs = [make_page(p) for p in range(12)]
+    serial = split_docs_by_tokens(docs, workers=1)
+
+    monkeypatch.setattr(token_splitter, "PARALLEL_SPLIT_MIN_DOCS", 2)
+    try:
+        parallel = split_docs_by_tokens(docs, workers=2)
+    finally:
+        shutdown_split_pool()
+
+    assert [c.page_content for c in parallel] == [c.page_content for c in serial]
+    assert [c.metadata for c in parallel] == [c.metadata for c in serial]